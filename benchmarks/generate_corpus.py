@@ -0,0 +1,214 @@
+import os
+import json
+import random
+import argparse
+
+# ========== CONFIGURATION ==========
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 72
+
+# Font sizes per role; the title is the largest so challenge 1a picks it as the document title
+FONT_SIZES = {'title': 24, 'H1': 18, 'H2': 15, 'H3': 13, 'body': 10}
+
+# Standard 14 PDF fonts (regular, bold) so no font files need to be embedded
+FONT_FAMILIES = [
+    ('Helvetica', 'Helvetica-Bold'),
+    ('Times-Roman', 'Times-Bold'),
+    ('Courier', 'Courier-Bold'),
+]
+
+HEADING_WORDS = [
+    'coastal', 'routes', 'harbour', 'markets', 'mountain', 'villages', 'river', 'valleys', 'festival',
+    'calendar', 'regional', 'dishes', 'vineyard', 'tours', 'museum', 'passes', 'railway', 'networks',
+    'island', 'ferries', 'castle', 'ruins', 'lavender', 'fields', 'cycling', 'trails', 'artisan',
+    'workshops', 'evening', 'concerts', 'seasonal', 'produce', 'historic', 'quarters', 'garden', 'walks'
+]
+
+BODY_WORDS = [
+    'the', 'visitors', 'often', 'find', 'that', 'local', 'guides', 'recommend', 'arriving', 'early',
+    'while', 'streets', 'are', 'quiet', 'and', 'shops', 'open', 'their', 'shutters', 'for', 'day',
+    'many', 'travellers', 'combine', 'short', 'walks', 'with', 'longer', 'excursions', 'along', 'coast',
+    'prices', 'vary', 'by', 'season', 'so', 'booking', 'ahead', 'is', 'usually', 'worthwhile'
+]
+
+
+# --- Content Generation ---
+def make_heading_text(rng, used):
+    while True:
+        words = rng.sample(HEADING_WORDS, rng.randint(2, 4))
+        text = ' '.join(w.capitalize() for w in words)
+        if text.lower() not in used:
+            used.add(text.lower())
+            return text
+
+
+def make_body_line(rng):
+    words = [rng.choice(BODY_WORDS) for _ in range(rng.randint(8, 13))]
+    return (' '.join(words)).capitalize() + '.'
+
+
+def heading_levels(rng, count, max_depth):
+    # Walk the hierarchy so a level never jumps more than one step deeper than its parent
+    levels = []
+    depth = 1
+    for i in range(count):
+        if i == 0:
+            depth = 1
+        else:
+            depth = rng.randint(1, min(depth + 1, max_depth))
+        levels.append(depth)
+    return levels
+
+
+def build_document(rng, pages, headings_per_page, max_depth, font_count, numbered):
+    """Lay out title, headings and body lines; return (page line lists, ground truth)"""
+    families = FONT_FAMILIES[:max(1, min(font_count, len(FONT_FAMILIES)))]
+    used = set()
+    title = make_heading_text(rng, used)
+    levels = heading_levels(rng, pages * headings_per_page, max_depth)
+    counters = [0, 0, 0]
+
+    page_lines = [[]]
+    outline = []
+    y = PAGE_HEIGHT - MARGIN
+
+    def place(text, size, font):
+        nonlocal y
+        leading = size * 1.6
+        if y - leading < MARGIN:
+            page_lines.append([])
+            y = PAGE_HEIGHT - MARGIN
+        y -= leading
+        page_lines[-1].append((font, size, MARGIN, y, text))
+
+    place(title, FONT_SIZES['title'], families[0][1])
+    for i, depth in enumerate(levels):
+        # Start a new page every headings_per_page headings
+        if i and i % headings_per_page == 0:
+            page_lines.append([])
+            y = PAGE_HEIGHT - MARGIN
+        family = families[i % len(families)]
+        text = make_heading_text(rng, used)
+        if numbered:
+            counters[depth - 1] += 1
+            for d in range(depth, len(counters)):
+                counters[d] = 0
+            text = '.'.join(str(c) for c in counters[:depth]) + ' ' + text
+        level = 'H%d' % depth
+        place(text, FONT_SIZES[level], family[1])
+        outline.append({'level': level, 'text': text, 'page': len(page_lines) - 1})
+        for _ in range(rng.randint(2, 4)):
+            place(make_body_line(rng), FONT_SIZES['body'], family[0])
+
+    return page_lines, {'title': title, 'outline': outline}
+
+
+# --- Minimal PDF Writer ---
+def escape_pdf_text(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, page_lines):
+    fonts = sorted({line[0] for lines in page_lines for line in lines})
+    font_ids = {name: 'F%d' % (i + 1) for i, name in enumerate(fonts)}
+
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(None)
+    pages_id = add(None)
+    font_refs = []
+    for name in fonts:
+        obj_id = add('<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % name)
+        font_refs.append('/%s %d 0 R' % (font_ids[name], obj_id))
+    resources = '<< /Font << %s >> >>' % ' '.join(font_refs)
+
+    page_ids = []
+    for lines in page_lines:
+        ops = ['BT /%s %g Tf 1 0 0 1 %g %g Tm (%s) Tj ET' % (font_ids[font], size, x, y, escape_pdf_text(text))
+               for font, size, x, y, text in lines]
+        stream = '\n'.join(ops)
+        content_id = add('<< /Length %d >>\nstream\n%s\nendstream' % (len(stream.encode('latin-1')), stream))
+        page_ids.append(add('<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>'
+                            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, resources, content_id)))
+
+    objects[catalog_id - 1] = '<< /Type /Catalog /Pages %d 0 R >>' % pages_id
+    objects[pages_id - 1] = '<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        ' '.join('%d 0 R' % pid for pid in page_ids), len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += ('%d 0 obj\n%s\nendobj\n' % (i, body)).encode('latin-1')
+    xref_offset = len(out)
+    out += ('xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)).encode('latin-1')
+    for off in offsets:
+        out += ('%010d 00000 n \n' % off).encode('latin-1')
+    out += ('trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (len(objects) + 1, catalog_id, xref_offset)).encode('latin-1')
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+# --- Corpus Generation ---
+def generate_corpus(out_dir, docs=5, pages=3, headings_per_page=3, max_depth=3, fonts=1, numbered=True, seed=0):
+    """Write docs synthetic PDFs plus a ground-truth JSON (challenge 1a output schema) for each"""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    generated = []
+    for i in range(docs):
+        name = 'synthetic_%03d' % (i + 1)
+        page_lines, truth = build_document(rng, pages, headings_per_page, max_depth, fonts, numbered)
+        pdf_path = os.path.join(out_dir, name + '.pdf')
+        write_pdf(pdf_path, page_lines)
+        with open(os.path.join(out_dir, name + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(truth, f, indent=2)
+        generated.append({'pdf': pdf_path, 'truth': truth, 'pages': len(page_lines)})
+    return generated
+
+
+def generate_collection(out_dir, docs=5, pages=3, seed=0, **kwargs):
+    """Write a challenge 1b style collection: PDFs/ plus challenge1b_input.json"""
+    generated = generate_corpus(os.path.join(out_dir, 'PDFs'), docs=docs, pages=pages, seed=seed, **kwargs)
+    input_data = {
+        'documents': [
+            {'filename': os.path.basename(g['pdf']), 'title': g['truth']['title']} for g in generated
+        ],
+        'persona': {'role': 'Travel Planner'},
+        'job_to_be_done': {'task': 'Plan a trip of 4 days for a group of 10 college friends.'}
+    }
+    with open(os.path.join(out_dir, 'challenge1b_input.json'), 'w', encoding='utf-8') as f:
+        json.dump(input_data, f, indent=2)
+    return generated
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output_dir', type=str, default='synthetic', help='Directory to write PDFs and ground truth to')
+    parser.add_argument('--docs', type=int, default=5, help='Number of documents to generate')
+    parser.add_argument('--pages', type=int, default=3, help='Pages per document')
+    parser.add_argument('--headings_per_page', type=int, default=3, help='Headings placed on each page')
+    parser.add_argument('--max_depth', type=int, default=3, choices=[1, 2, 3], help='Deepest heading level (H1-H3)')
+    parser.add_argument('--fonts', type=int, default=1, choices=[1, 2, 3], help='Number of font families to cycle through')
+    parser.add_argument('--no_numbering', action='store_true', help='Omit 1 / 1.1 / 1.1.1 heading numbers')
+    parser.add_argument('--collection', action='store_true', help='Write a challenge 1b collection layout instead')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    options = dict(docs=args.docs, pages=args.pages, headings_per_page=args.headings_per_page,
+                   max_depth=args.max_depth, fonts=args.fonts, numbered=not args.no_numbering, seed=args.seed)
+    if args.collection:
+        generated = generate_collection(args.output_dir, **options)
+    else:
+        generated = generate_corpus(args.output_dir, **options)
+    print("Generated %d PDFs in %s" % (len(generated), args.output_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+import os
+import io
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+from generate_corpus import generate_corpus, generate_collection
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Both challenges ship a main.py, so they are loaded by path under distinct module names
+_modules = {}
+
+
+def load_challenge(name):
+    if name not in _modules:
+        spec = importlib.util.spec_from_file_location(name + '_main', os.path.join(REPO_ROOT, name, 'main.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+# --- Measurement Helpers ---
+def percentile(values, q):
+    # Nearest-rank percentile; q in [0, 100]
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(q / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(latencies):
+    return {
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'max': max(latencies) if latencies else 0.0
+    }
+
+
+def normalize(text):
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def heading_recovery(result, truth):
+    """Compare a challenge 1a outline against generated ground truth on (text, page).
+
+    Levels are scored separately over the headings that were found, as the share whose
+    level matches the ground truth. A predicted heading equal to the document title is
+    not counted as a false positive.
+    """
+    expected = {(normalize(h['text']), h['page']): h['level'] for h in truth['outline']}
+    title = normalize(truth['title'])
+    predicted = {(normalize(h['text']), h['page']): h['level'] for h in result['outline'] if normalize(h['text']) != title}
+    found = set(expected) & set(predicted)
+    return {
+        'tp': len(found),
+        'fp': len(set(predicted) - set(expected)),
+        'fn': len(set(expected) - set(predicted)),
+        'level_matches': sum(1 for key in found if expected[key] == predicted[key])
+    }
+
+
+def accuracy_summary(recoveries):
+    tp = sum(r['tp'] for r in recoveries)
+    fp = sum(r['fp'] for r in recoveries)
+    fn = sum(r['fn'] for r in recoveries)
+    level_matches = sum(r['level_matches'] for r in recoveries)
+    return {
+        'precision': tp / (tp + fp) if tp + fp else 1.0,
+        'recall': tp / (tp + fn) if tp + fn else 1.0,
+        'level_accuracy': level_matches / tp if tp else 1.0
+    }
+
+
+def section_recovery(sections, truth):
+    """Compare challenge 1b sections against generated ground truth.
+
+    A ground-truth heading is recovered when it appears as a section title. Its boundary is
+    correct when the section has content and that content holds no other heading, i.e. the
+    section neither came out empty nor ran into the next one.
+    """
+    headings = [normalize(h['text']) for h in truth['outline']]
+    expected = set(headings)
+    title = normalize(truth['title'])
+    by_title = {}
+    for sec in sections:
+        by_title.setdefault(normalize(sec['title']), sec)
+    predicted = [t for t in by_title if t != title]
+    found = [t for t in predicted if t in expected]
+    boundaries = 0
+    for t in found:
+        content = normalize(by_title[t]['content'])
+        if content and not any(other in content for other in expected if other != t):
+            boundaries += 1
+    return {'tp': len(found), 'fp': len(predicted) - len(found), 'fn': len(expected) - len(found), 'boundaries': boundaries}
+
+
+def section_summary(recoveries):
+    tp = sum(r['tp'] for r in recoveries)
+    fp = sum(r['fp'] for r in recoveries)
+    fn = sum(r['fn'] for r in recoveries)
+    return {
+        'title_precision': tp / (tp + fp) if tp + fp else 1.0,
+        'title_recall': tp / (tp + fn) if tp + fn else 1.0,
+        'boundary_accuracy': sum(r['boundaries'] for r in recoveries) / tp if tp else 0.0
+    }
+
+
+def run_outline(pdf_path):
+    # Worker entry point: returns the outline and wall-clock latency for one PDF
+    challenge1a = load_challenge('challenge1a')
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = challenge1a.extract_outline(pdf_path)
+    return result, time.perf_counter() - start
+
+
+def peak_memory_mb(func, *args):
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+# --- Sweeps ---
+def sweep_document_size(work_dir, page_counts, docs, options, seed):
+    """Challenge 1a latency, throughput and peak memory as page count grows (single process)"""
+    challenge1a = load_challenge('challenge1a')
+    rows = []
+    for pages in page_counts:
+        corpus = generate_corpus(os.path.join(work_dir, 'size_%d' % pages), docs=docs, pages=pages, seed=seed, **options)
+        latencies = []
+        recoveries = []
+        start = time.perf_counter()
+        for doc in corpus:
+            result, latency = run_outline(doc['pdf'])
+            latencies.append(latency)
+            recoveries.append(heading_recovery(result, doc['truth']))
+        elapsed = time.perf_counter() - start
+        # Memory is measured in a separate pass so tracing overhead does not skew the timings
+        memory = peak_memory_mb(challenge1a.extract_outline, corpus[0]['pdf'])
+        total_pages = sum(doc['pages'] for doc in corpus)
+        rows.append(dict(
+            pages=pages,
+            numbered=options['numbered'],
+            docs_per_sec=len(corpus) / elapsed,
+            pages_per_sec=total_pages / elapsed,
+            latency=latency_summary(latencies),
+            peak_memory_mb=memory,
+            accuracy=accuracy_summary(recoveries)
+        ))
+        print("pages=%d: %.1f pages/s, p50 %.3fs, peak %.1f MB, recall %.3f, levels %.3f"
+              % (pages, rows[-1]['pages_per_sec'], rows[-1]['latency']['p50'], memory,
+                 rows[-1]['accuracy']['recall'], rows[-1]['accuracy']['level_accuracy']))
+    return rows
+
+
+def sweep_workers(work_dir, worker_counts, docs, pages, options, seed):
+    """Challenge 1a throughput over a fixed corpus as the process pool grows"""
+    corpus = generate_corpus(os.path.join(work_dir, 'workers'), docs=docs, pages=pages, seed=seed, **options)
+    total_pages = sum(doc['pages'] for doc in corpus)
+    rows = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_outline, [doc['pdf'] for doc in corpus]))
+        elapsed = time.perf_counter() - start
+        latencies = [latency for _, latency in results]
+        recoveries = [heading_recovery(result, doc['truth']) for (result, _), doc in zip(results, corpus)]
+        rows.append(dict(
+            workers=workers,
+            numbered=options['numbered'],
+            docs_per_sec=len(corpus) / elapsed,
+            pages_per_sec=total_pages / elapsed,
+            latency=latency_summary(latencies),
+            accuracy=accuracy_summary(recoveries)
+        ))
+        print("workers=%d: %.1f docs/s, p90 %.3fs, recall %.3f"
+              % (workers, rows[-1]['docs_per_sec'], rows[-1]['latency']['p90'], rows[-1]['accuracy']['recall']))
+    return rows
+
+
+def sweep_variants(work_dir, font_counts, docs, pages, options, seed):
+    """Challenge 1a accuracy and latency across font diversity, with and without numbering"""
+    rows = []
+    for fonts in font_counts:
+        for numbered in (True, False):
+            variant = dict(options, fonts=fonts, numbered=numbered)
+            corpus = generate_corpus(os.path.join(work_dir, 'variant_%d_%s' % (fonts, numbered)),
+                                     docs=docs, pages=pages, seed=seed, **variant)
+            latencies = []
+            recoveries = []
+            for doc in corpus:
+                result, latency = run_outline(doc['pdf'])
+                latencies.append(latency)
+                recoveries.append(heading_recovery(result, doc['truth']))
+            rows.append(dict(
+                fonts=fonts,
+                numbered=numbered,
+                latency=latency_summary(latencies),
+                accuracy=accuracy_summary(recoveries)
+            ))
+            print("fonts=%d numbered=%s: p50 %.3fs, recall %.3f, levels %.3f"
+                  % (fonts, numbered, rows[-1]['latency']['p50'],
+                     rows[-1]['accuracy']['recall'], rows[-1]['accuracy']['level_accuracy']))
+    return rows
+
+
+def run_shared_pipeline(corpus, artifacts_dir):
+    """Run challenge 1a with the features cache, then challenge 1b on its outputs"""
+    challenge1a = load_challenge('challenge1a')
+    challenge1b = load_challenge('challenge1b')
+    outline_dir = os.path.join(artifacts_dir, 'outlines')
+    features_dir = os.path.join(artifacts_dir, 'features')
+    os.makedirs(outline_dir, exist_ok=True)
+    os.makedirs(features_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    for doc in corpus:
+        stem = os.path.splitext(os.path.basename(doc['pdf']))[0]
+        line_features = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = challenge1a.extract_outline(doc['pdf'], line_features)
+        with open(os.path.join(outline_dir, stem + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        challenge1a.write_line_features(os.path.join(features_dir, stem + '.json'), doc['pdf'], line_features)
+    outline_seconds = time.perf_counter() - start
+
+    sections = []
+    latencies = []
+    start = time.perf_counter()
+    for doc in corpus:
+        doc_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sections.append(challenge1b.extract_sections(doc['pdf'], outline_dir, features_dir))
+        latencies.append(time.perf_counter() - doc_start)
+    return outline_seconds, time.perf_counter() - start, latencies, sections
+
+
+def sweep_collection_size(work_dir, collection_sizes, pages, options, seed):
+    """Challenge 1b section extraction and ranking as the collection grows.
+
+    Each collection is processed twice: by 1b on its own, and through the shared path where
+    1a writes outlines and line features that 1b then reads. Sections from both are checked
+    against the generated headings.
+    """
+    challenge1b = load_challenge('challenge1b')
+    rows = []
+    for size in collection_sizes:
+        collection_dir = os.path.join(work_dir, 'collection_%d' % size)
+        corpus = generate_collection(collection_dir, docs=size, pages=pages, seed=seed, **options)
+        with open(os.path.join(collection_dir, 'challenge1b_input.json'), 'r', encoding='utf-8') as f:
+            input_data = json.load(f)
+        persona = input_data['persona']['role']
+        job = input_data['job_to_be_done']['task']
+
+        latencies = []
+        standalone = []
+        start = time.perf_counter()
+        for doc in corpus:
+            doc_start = time.perf_counter()
+            standalone.append(challenge1b.extract_sections(doc['pdf']))
+            latencies.append(time.perf_counter() - doc_start)
+        challenge1b.score_sections_rule_based(sum(standalone, []), persona, job, challenge1b.TARGET_KEYWORDS)
+        elapsed = time.perf_counter() - start
+
+        outline_seconds, shared_seconds, shared_latencies, shared = run_shared_pipeline(
+            corpus, os.path.join(collection_dir, 'shared'))
+        start = time.perf_counter()
+        challenge1b.score_sections_rule_based(sum(shared, []), persona, job, challenge1b.TARGET_KEYWORDS)
+        shared_seconds += time.perf_counter() - start
+
+        rows.append(dict(
+            documents=size,
+            seconds=elapsed,
+            docs_per_sec=size / elapsed,
+            sections=sum(len(s) for s in standalone),
+            latency=latency_summary(latencies),
+            accuracy=section_summary([section_recovery(s, doc['truth']) for s, doc in zip(standalone, corpus)]),
+            shared=dict(
+                outline_seconds=outline_seconds,
+                seconds=shared_seconds,
+                sections=sum(len(s) for s in shared),
+                latency=latency_summary(shared_latencies),
+                accuracy=section_summary([section_recovery(s, doc['truth']) for s, doc in zip(shared, corpus)])
+            )
+        ))
+        print("collection=%d: 1b %.2fs (titles %.3f), 1a+1b shared %.2fs + %.2fs (titles %.3f, boundaries %.3f)"
+              % (size, elapsed, rows[-1]['accuracy']['title_recall'], outline_seconds, shared_seconds,
+                 rows[-1]['shared']['accuracy']['title_recall'], rows[-1]['shared']['accuracy']['boundary_accuracy']))
+    return rows
+
+
+def accuracy_failures(results, min_recall, min_level_accuracy):
+    # A speedup is only worth keeping if the generated headings are still recovered
+    failures = []
+    for sweep in ('document_size', 'workers', 'variants'):
+        for row in results[sweep]:
+            label = ', '.join('%s=%s' % (k, row[k]) for k in ('pages', 'workers', 'fonts', 'numbered') if k in row)
+            if row['accuracy']['recall'] < min_recall:
+                failures.append("%s %s: heading recall %.3f below %.3f" % (sweep, label, row['accuracy']['recall'], min_recall))
+            # 1a labels numbered top-level headings ("1 ...") as H2 whatever their size, so
+            # levels are only gated on unnumbered corpora; numbered ones are reported only
+            if not row['numbered'] and row['accuracy']['level_accuracy'] < min_level_accuracy:
+                failures.append("%s %s: level accuracy %.3f below %.3f"
+                                % (sweep, label, row['accuracy']['level_accuracy'], min_level_accuracy))
+    for row in results['collection_size']:
+        accuracy = row['shared']['accuracy']
+        for key in ('title_recall', 'boundary_accuracy'):
+            if accuracy[key] < min_recall:
+                failures.append("collection_size documents=%d: shared %s %.3f below %.3f"
+                                % (row['documents'], key, accuracy[key], min_recall))
+    return failures
+
+
+# --- Plotting ---
+def plot_results(results, plot_path):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed; skipping plots")
+        return
+
+    size_rows = results['document_size']
+    worker_rows = results['workers']
+    variant_rows = results['variants']
+    collection_rows = results['collection_size']
+    fig, axes = plt.subplots(3, 2, figsize=(12, 13))
+
+    pages = [r['pages'] for r in size_rows]
+    axes[0][0].plot(pages, [r['pages_per_sec'] for r in size_rows], marker='o')
+    axes[0][0].set_title('1a throughput vs document size')
+    axes[0][0].set_xlabel('pages per document')
+    axes[0][0].set_ylabel('pages / s')
+
+    for q in ('p50', 'p90', 'p99'):
+        axes[0][1].plot(pages, [r['latency'][q] for r in size_rows], marker='o', label=q)
+    mem_axis = axes[0][1].twinx()
+    mem_axis.plot(pages, [r['peak_memory_mb'] for r in size_rows], color='grey', linestyle='--', label='peak MB')
+    mem_axis.set_ylabel('peak traced memory (MB)')
+    axes[0][1].set_title('1a latency percentiles and memory vs document size')
+    axes[0][1].set_xlabel('pages per document')
+    axes[0][1].set_ylabel('seconds per document')
+    axes[0][1].legend(loc='upper left')
+
+    workers = [r['workers'] for r in worker_rows]
+    axes[1][0].plot(workers, [r['docs_per_sec'] for r in worker_rows], marker='o')
+    axes[1][0].set_title('1a throughput vs worker count')
+    axes[1][0].set_xlabel('worker processes')
+    axes[1][0].set_ylabel('documents / s')
+
+    labels = ['%d font%s\n%s' % (r['fonts'], '' if r['fonts'] == 1 else 's', 'numbered' if r['numbered'] else 'plain')
+              for r in variant_rows]
+    positions = range(len(variant_rows))
+    axes[1][1].bar([p - 0.2 for p in positions], [r['accuracy']['recall'] for r in variant_rows], width=0.4, label='recall')
+    axes[1][1].bar([p + 0.2 for p in positions], [r['accuracy']['level_accuracy'] for r in variant_rows], width=0.4,
+                   label='level accuracy')
+    axes[1][1].set_xticks(list(positions))
+    axes[1][1].set_xticklabels(labels)
+    axes[1][1].set_ylim(0, 1.05)
+    axes[1][1].set_title('1a accuracy vs font diversity and numbering')
+    axes[1][1].legend(loc='lower right')
+
+    sizes = [r['documents'] for r in collection_rows]
+    axes[2][0].plot(sizes, [r['seconds'] for r in collection_rows], marker='o', label='1b alone')
+    axes[2][0].plot(sizes, [r['shared']['outline_seconds'] + r['shared']['seconds'] for r in collection_rows],
+                    marker='o', label='1a + 1b shared')
+    axes[2][0].plot(sizes, [r['shared']['seconds'] for r in collection_rows], marker='o', label='1b from 1a artifacts')
+    axes[2][0].set_title('1b extraction and ranking vs collection size')
+    axes[2][0].set_xlabel('documents in collection')
+    axes[2][0].set_ylabel('seconds')
+    axes[2][0].legend()
+
+    axes[2][1].plot(sizes, [r['accuracy']['title_recall'] for r in collection_rows], marker='o', label='1b alone: titles')
+    axes[2][1].plot(sizes, [r['shared']['accuracy']['title_recall'] for r in collection_rows], marker='o',
+                    label='shared: titles')
+    axes[2][1].plot(sizes, [r['shared']['accuracy']['boundary_accuracy'] for r in collection_rows], marker='x',
+                    linestyle='--', label='shared: boundaries')
+    axes[2][1].set_ylim(0, 1.05)
+    axes[2][1].set_title('1b section accuracy vs collection size')
+    axes[2][1].set_xlabel('documents in collection')
+    axes[2][1].legend()
+
+    fig.tight_layout()
+    fig.savefig(plot_path)
+    print("Plot written to", plot_path)
+
+
+def parse_int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=parse_int_list, default=[1, 5, 20, 50], help='Comma-separated page counts to sweep')
+    parser.add_argument('--workers', type=parse_int_list, default=[1, 2, 4], help='Comma-separated worker counts to sweep')
+    parser.add_argument('--collections', type=parse_int_list, default=[3, 10, 30], help='Comma-separated collection sizes to sweep')
+    parser.add_argument('--variant_fonts', type=parse_int_list, default=[1, 2, 3], help='Comma-separated font counts to sweep, each with and without numbering')
+    parser.add_argument('--docs', type=int, default=5, help='Documents per sweep point for 1a sweeps')
+    parser.add_argument('--worker_pages', type=int, default=5, help='Pages per document in the worker and variant sweeps')
+    parser.add_argument('--collection_pages', type=int, default=3, help='Pages per document in the collection sweep')
+    parser.add_argument('--fonts', type=int, default=2, choices=[1, 2, 3], help='Font families outside the variant sweep')
+    parser.add_argument('--headings_per_page', type=int, default=3, help='Headings placed on each generated page')
+    parser.add_argument('--max_depth', type=int, default=3, choices=[1, 2, 3], help='Deepest generated heading level (H1-H3)')
+    parser.add_argument('--no_numbering', action='store_true', help='Omit heading numbers outside the variant sweep')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic corpus')
+    parser.add_argument('--min_recall', type=float, default=0.9, help='Fail if heading or section recall drops below this')
+    parser.add_argument('--min_level_accuracy', type=float, default=0.9, help='Fail if heading level accuracy on unnumbered corpora drops below this')
+    parser.add_argument('--work_dir', type=str, default=None, help='Where to write the corpus (default: temporary directory)')
+    parser.add_argument('--output', type=str, default='scaling_results.json', help='Path to results JSON file')
+    parser.add_argument('--plot', type=str, default='scaling_results.png', help='Path to plot image')
+    args = parser.parse_args()
+
+    options = dict(fonts=args.fonts, headings_per_page=args.headings_per_page,
+                   max_depth=args.max_depth, numbered=not args.no_numbering)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = args.work_dir or tmp_dir
+        results = {
+            'document_size': sweep_document_size(work_dir, args.pages, args.docs, options, args.seed),
+            'workers': sweep_workers(work_dir, args.workers, max(args.docs, max(args.workers) * 2),
+                                     args.worker_pages, options, args.seed),
+            'variants': sweep_variants(work_dir, args.variant_fonts, args.docs, args.worker_pages, options, args.seed),
+            'collection_size': sweep_collection_size(work_dir, args.collections, args.collection_pages, options, args.seed)
+        }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print("Results written to", args.output)
+    plot_results(results, args.plot)
+
+    failures = accuracy_failures(results, args.min_recall, args.min_level_accuracy)
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
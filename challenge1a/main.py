@@ -1,5 +1,7 @@
 import os
 import json
+import argparse
+import hashlib
 from pdfminer.high_level import extract_pages
 from pdfminer.layout import LTTextContainer, LTChar, LTTextBox
 import re
@@ -21,46 +23,84 @@ def collect_ltchars(container):
                 chars.extend(collect_ltchars(obj))
     return chars
 
-def analyze_font_characteristics(pdf_path):
-    """Analyze font sizes and characteristics across the document to establish thresholds"""
-    font_data = []
-    
-    for page_layout in extract_pages(pdf_path):
+def collect_line_records(pdf_path):
+    """Stream the PDF once and keep only per-line features, not the pdfminer layout tree.
+
+    Lines inside a text box come first; a box whose lines carry no characters is recorded
+    as a single entry with from_box set, mirroring the heading detection fallback.
+    """
+    records = []
+    for page_num, page_layout in enumerate(extract_pages(pdf_path), 1):
+        page_height = page_layout.height
+        prev_y = None
         for element in page_layout:
-            if isinstance(element, LTTextContainer):
-                for text_line in element:
-                    line_text = text_line.get_text().strip()
-                    if not line_text or len(line_text) < 3:
-                        continue
-                        
-                    font_sizes = []
-                    font_names = []
-                    
-                    for char in getattr(text_line, 'objs', []):
-                        if isinstance(char, LTChar):
-                            font_sizes.append(char.size)
-                            font_names.append(char.fontname if hasattr(char, 'fontname') else '')
-                    
-                    # Italic detection
-                    is_italic = any('italic' in name.lower() or 'oblique' in name.lower() for name in font_names if name)
+            if not isinstance(element, LTTextContainer):
+                continue
+            lines_found_in_box = False
+            for text_line in element:
+                line_text = text_line.get_text().strip()
+                if not line_text:
+                    continue
+                record = line_record(text_line, line_text, page_num, page_height, prev_y)
+                if record is None:
+                    continue
+                prev_y = record["y_position"]
+                records.append(record)
+                lines_found_in_box = True
+            if not lines_found_in_box:
+                box_text = element.get_text().strip()
+                if not box_text:
+                    continue
+                record = line_record(element, box_text, page_num, page_height, prev_y, from_box=True)
+                if record is None:
+                    continue
+                prev_y = record["y_position"]
+                records.append(record)
+    return records
 
-                    # Whitespace-above analysis (difference in y0 from previous line)
-                    whitespace_above = None
-                    if hasattr(text_line, 'y0') and hasattr(text_line, 'y1'):
-                        whitespace_above = text_line.y0  # Will be used in context of previous line
+def line_record(container, text, page_num, page_height, prev_y, from_box=False):
+    chars = collect_ltchars(container)
+    font_sizes = [char.size for char in chars]
+    font_names = [getattr(char, 'fontname', '') for char in chars]
+    if not font_sizes:
+        return None
+    y_position = getattr(container, 'y0', 0)
+    # Threshold analysis reads a line's 'objs' attribute, which the pinned pdfminer.six does
+    # not provide: this size is always None, so determine_heading_thresholds always returns
+    # its defaults. The committed outputs depend on that, so do not switch this to
+    # collect_ltchars without regenerating and reviewing every 1a output.
+    analysis_sizes = [char.size for char in getattr(container, 'objs', []) if isinstance(char, LTChar)]
+    return {
+        "text": text,
+        "font_size": sum(font_sizes) / len(font_sizes),
+        "is_bold": any('bold' in name.lower() for name in font_names if name),
+        "is_italic": any('italic' in name.lower() or 'oblique' in name.lower() for name in font_names if name),
+        "y_position": y_position,
+        "whitespace_above": None if prev_y is None else y_position - prev_y,
+        "page": page_num,
+        "page_height": page_height,
+        "from_box": from_box,
+        "analysis_font_size": sum(analysis_sizes) / len(analysis_sizes) if analysis_sizes else None
+    }
 
-                    if font_sizes:
-                        avg_font = sum(font_sizes) / len(font_sizes)
-                        is_bold = any('bold' in name.lower() for name in font_names if name)
-                        font_data.append({
-                            'text': line_text,
-                            'font_size': avg_font,
-                            'is_bold': is_bold,
-                            'is_italic': is_italic,
-                            'length': len(line_text),
-                            'y_position': getattr(text_line, 'y0', 0),
-                            'whitespace_above': whitespace_above
-                        })
+def analyze_font_characteristics(pdf_path, records=None):
+    """Analyze font sizes and characteristics across the document to establish thresholds"""
+    if records is None:
+        records = collect_line_records(pdf_path)
+    font_data = []
+    for record in records:
+        line_text = record['text']
+        if record['from_box'] or len(line_text) < 3 or record['analysis_font_size'] is None:
+            continue
+        font_data.append({
+            'text': line_text,
+            'font_size': record['analysis_font_size'],
+            'is_bold': record['is_bold'],
+            'is_italic': record['is_italic'],
+            'length': len(line_text),
+            'y_position': record['y_position'],
+            'whitespace_above': record['y_position']
+        })
     
     return font_data
 
@@ -258,80 +298,42 @@ def improved_extract_title(headings):
     # Fallback: first heading
     return clean_heading_text(headings[0]['text'])
 
-def extract_outline(pdf_path):
-    """Extract structured outline from PDF with improved logic"""
+def extract_outline(pdf_path, line_features=None):
+    """Extract structured outline from PDF with improved logic.
+
+    If line_features is a list, the per-line features (text, font, position, 1-based page)
+    are appended to it so challenge 1b can slice sections without re-parsing the PDF.
+    Box-level fallback entries are left out so the list matches challenge 1b's own lines.
+    """
     print(f"Processing: {os.path.basename(pdf_path)}")
-    font_data = analyze_font_characteristics(pdf_path)
+    # One parse: thresholds and heading detection both work from the collected line records
+    records = collect_line_records(pdf_path)
+    font_data = analyze_font_characteristics(pdf_path, records)
     thresholds = determine_heading_thresholds(font_data)
     print(f"Font thresholds: {thresholds}")
-    outline = []
     raw_headings = []
-    any_lines_found = False
-    for page_num, page_layout in enumerate(extract_pages(pdf_path), 1):
-        page_height = page_layout.height
-        prev_y = None
-        for element in page_layout:
-            if isinstance(element, LTTextContainer):
-                lines_found_in_box = False
-                for text_line in element:
-                    line_text = text_line.get_text().strip()
-                    if not line_text:
-                        continue
-                    chars = collect_ltchars(text_line)
-                    font_sizes = [char.size for char in chars]
-                    font_names = [getattr(char, 'fontname', '') for char in chars]
-                    if not font_sizes:
-                        continue
-                    avg_font = sum(font_sizes) / len(font_sizes)
-                    is_bold = any('bold' in name.lower() for name in font_names if name)
-                    is_italic = any('italic' in name.lower() or 'oblique' in name.lower() for name in font_names if name)
-                    y_position = getattr(text_line, 'y0', 0)
-                    whitespace_above = None
-                    if prev_y is not None:
-                        whitespace_above = y_position - prev_y
-                    prev_y = y_position
-                    is_heading, level = is_likely_heading(
-                        line_text, avg_font, is_bold, is_italic, whitespace_above, y_position, thresholds, page_height
-                    )
-                    if is_heading and level:
-                        heading_entry = {
-                            "level": level,
-                            "text": line_text,
-                            "page": normalize_page_number(page_num),
-                            "y_position": y_position
-                        }
-                        raw_headings.append(heading_entry)
-                    any_lines_found = True
-                    lines_found_in_box = True
-                if not lines_found_in_box:
-                    box_text = element.get_text().strip()
-                    if not box_text:
-                        continue
-                    chars = collect_ltchars(element)
-                    font_sizes = [char.size for char in chars]
-                    font_names = [getattr(char, 'fontname', '') for char in chars]
-                    if not font_sizes:
-                        continue
-                    avg_font = sum(font_sizes) / len(font_sizes)
-                    is_bold = any('bold' in name.lower() for name in font_names if name)
-                    is_italic = any('italic' in name.lower() or 'oblique' in name.lower() for name in font_names if name)
-                    y_position = getattr(element, 'y0', 0)
-                    whitespace_above = None
-                    if prev_y is not None:
-                        whitespace_above = y_position - prev_y
-                    prev_y = y_position
-                    is_heading, level = is_likely_heading(
-                        box_text, avg_font, is_bold, is_italic, whitespace_above, y_position, thresholds, page_height
-                    )
-                    if is_heading and level:
-                        heading_entry = {
-                            "level": level,
-                            "text": box_text,
-                            "page": normalize_page_number(page_num),
-                            "y_position": y_position
-                        }
-                        raw_headings.append(heading_entry)
-                    any_lines_found = True
+    for record in records:
+        if line_features is not None and not record["from_box"]:
+            line_features.append({
+                "text": record["text"],
+                "font_size": record["font_size"],
+                "is_bold": record["is_bold"],
+                "is_italic": record["is_italic"],
+                "y_position": record["y_position"],
+                "page": record["page"]
+            })
+        is_heading, level = is_likely_heading(
+            record["text"], record["font_size"], record["is_bold"], record["is_italic"],
+            record["whitespace_above"], record["y_position"], thresholds, record["page_height"]
+        )
+        if is_heading and level:
+            heading_entry = {
+                "level": level,
+                "text": record["text"],
+                "page": normalize_page_number(record["page"]),
+                "y_position": record["y_position"]
+            }
+            raw_headings.append(heading_entry)
     # Merge multi-line headings
     merged_headings = merge_multiline_headings(raw_headings)
     # Filter out generic/boilerplate headings
@@ -351,12 +353,33 @@ def extract_outline(pdf_path):
     print(f"Found {len(final_headings)} headings. Title: {title}")
     return {"title": title, "outline": final_headings}
 
+def pdf_fingerprint(pdf_path):
+    # Identifies the exact PDF a features file was built from, so stale caches can be detected
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {"size": os.path.getsize(pdf_path), "sha256": digest.hexdigest()}
+
+def write_line_features(features_path, pdf_path, line_features):
+    # The features file challenge 1b reads through --features_dir
+    with open(features_path, "w", encoding="utf-8") as f:
+        json.dump({"source": pdf_fingerprint(pdf_path), "lines": line_features}, f, ensure_ascii=False)
+
 def main():
     """Main function to process all PDFs in input directory"""
-    os.makedirs(input_dir, exist_ok=True)
-    os.makedirs(output_dir, exist_ok=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input_dir', type=str, default=input_dir, help='Directory containing PDF files')
+    parser.add_argument('--output_dir', type=str, default=output_dir, help='Directory for outline JSON files')
+    parser.add_argument('--features_dir', type=str, default=None, help='Optional directory for cached line features shared with challenge 1b')
+    args = parser.parse_args()
+
+    os.makedirs(args.input_dir, exist_ok=True)
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.features_dir:
+        os.makedirs(args.features_dir, exist_ok=True)
     
-    pdf_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.pdf')]
+    pdf_files = [f for f in os.listdir(args.input_dir) if f.lower().endswith('.pdf')]
     
     if not pdf_files:
         print(f"No PDFs found.")
@@ -364,13 +387,16 @@ def main():
     
     for filename in pdf_files:
         print(f"Processing {filename}")
-        full_path = os.path.join(input_dir, filename)
+        full_path = os.path.join(args.input_dir, filename)
         try:
-            result = extract_outline(full_path)
+            line_features = [] if args.features_dir else None
+            result = extract_outline(full_path, line_features)
             output_filename = os.path.splitext(filename)[0] + ".json"
-            output_path = os.path.join(output_dir, output_filename)
+            output_path = os.path.join(args.output_dir, output_filename)
             with open(output_path, "w", encoding="utf-8") as f:
                 json.dump(result, f, indent=2, ensure_ascii=False)
+            if line_features is not None:
+                write_line_features(os.path.join(args.features_dir, output_filename), full_path, line_features)
             print(f"Saved: {output_filename}")
         except Exception as e:
             print(f"Error: {filename}")
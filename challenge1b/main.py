@@ -1,5 +1,6 @@
 import os
 import json
+import hashlib
 
 import datetime
 import re
@@ -25,6 +26,13 @@ EXPECTED_SECTION_PATTERNS = [
     'Nightlife and Entertainment',
 ]
 
+# Guards for trusting a challenge 1a outline as section boundaries
+OUTLINE_MIN_MATCHED_SHARE = 0.8  # outline headings that must be found among the lines
+OUTLINE_MAX_HEADING_SHARE = 0.4  # lines that may be consumed by headings
+OUTLINE_MAX_EMPTY_SHARE = 0.5    # sections that may come out with no content
+# Challenge 1a merges same-level headings whose y positions are this close
+OUTLINE_MERGE_DISTANCE = 30
+
 # Generic headings to filter out
 GENERIC_HEADINGS = set([
     'overview', 'abstract', 'mission statement', 'address:', 'goals:', 'summary', 'background', 'table of contents', 'contents', 'keywords:', 'references', 'appendix', 'milestones', 'timeline:', 'contact', 'date', 'page', 'author', 'introduction', 'acknowledgements', 'revision history', 'proposal', 'rsvp:', 'www.topjump.com', 'hope to see you there!', 'topjump', 'march 21, 2003', 'digital library', 'business plan', 'prosperity strategy', 'stem pathways', 'regular pathway', 'distinction pathway', 'pathway options', 'school', 'student', 'experience', 'support', 'future opportunities', 'career', 'objectives', 'structure', 'duration', 'requirements', 'audience', 'trademarks', 'documents and web sites', 'synthesis', 'preparation', 'methods', 'results', 'discussion', 'conclusion', 'appendix a', 'appendix b', 'appendix c', 'appendix d', 'appendix e', 'appendix f', 'appendix g', 'appendix h', 'appendix i', 'appendix j', 'appendix k', 'appendix l', 'appendix m', 'appendix n', 'appendix o', 'appendix p', 'appendix q', 'appendix r', 'appendix s', 'appendix t', 'appendix u', 'appendix v', 'appendix w', 'appendix x', 'appendix y', 'appendix z'
@@ -73,8 +81,8 @@ def fuzzy_match(text, patterns, threshold=0.7):
         return best_pat, best_score
     return None, 0
 
-# --- Enhanced Section Extraction with Fuzzy Matching ---
-def extract_sections_expected(pdf_path):
+# --- Line Feature Extraction ---
+def extract_lines(pdf_path):
     lines = []
     for page_num, page_layout in enumerate(extract_pages(pdf_path), 1):
         for element in page_layout:
@@ -102,11 +110,152 @@ def extract_sections_expected(pdf_path):
                         "y_position": y_position,
                         "page": page_num
                     })
+    return lines
+
+def pdf_fingerprint(pdf_path):
+    # Same fingerprint challenge 1a stores with its line features
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {"size": os.path.getsize(pdf_path), "sha256": digest.hexdigest()}
+
+def load_cached_lines(features_path, pdf_path):
+    # Line features written by challenge 1a (--features_dir); same schema as extract_lines.
+    # Returns None when the cache is unreadable or was built from a different version of the PDF.
+    try:
+        with open(features_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('source') != pdf_fingerprint(pdf_path):
+            print(f"Warning: stale line features for {os.path.basename(pdf_path)}, re-parsing")
+            return None
+        lines = []
+        for l in cached.get('lines', []):
+            text = clean_text(l["text"])
+            if not text:
+                continue
+            lines.append({
+                "text": text,
+                "font_size": l["font_size"],
+                "is_bold": l["is_bold"],
+                "is_italic": l["is_italic"],
+                "y_position": l["y_position"],
+                "page": l["page"]
+            })
+        return lines
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        print(f"Warning: unreadable line features for {os.path.basename(pdf_path)}, re-parsing")
+        return None
+
+def load_outline(outline_path):
+    # Returns [] when the outline JSON is unreadable, so the local heading detection is used
+    try:
+        with open(outline_path, 'r', encoding='utf-8') as f:
+            outline = json.load(f).get('outline', [])
+        return [{"level": str(entry.get("level", "H1")), "text": str(entry["text"]), "page": int(entry["page"])}
+                for entry in outline]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        print(f"Warning: unreadable outline {os.path.basename(outline_path)}, not used")
+        return []
+
+def no_lines_fallback(pdf_path):
+    with open(pdf_path, 'rb') as f:
+        content = f.read().decode(errors='ignore')
+    return [{"title": "Document", "content": content, "page": 0}]
+
+def slice_sections(lines, headings):
+    # Each heading's content runs from its first line up to the next heading, minus its own lines
+    sections = []
+    for i, h in enumerate(headings):
+        heading_lines = set(h.get("lines", [h["idx"]]))
+        end = headings[i+1]["idx"] if i+1 < len(headings) else len(lines)
+        content = " ".join([lines[j]["text"] for j in range(h["idx"], end) if j not in heading_lines]).strip()
+        sections.append({
+            "title": h["text"],
+            "content": content,
+            "page": h["page"]
+        })
+    return sections
+
+# --- Section Extraction from a Challenge 1A Outline ---
+def match_outline_heading(lines, start, target, page):
+    """Find the lines that make up one outline heading, searching forward from start.
+
+    The heading must be rebuilt exactly. Challenge 1a may merge headings that are not on
+    adjacent lines, so later pieces are taken from nearby lines on the same page.
+    """
+    for i in range(start, len(lines)):
+        first = lines[i]
+        if first["page"] > page:
+            break
+        if first["page"] != page:
+            continue
+        if first["text"] != target and not target.startswith(first["text"] + " "):
+            continue
+        heading_lines = [i]
+        matched = first["text"]
+        j = i + 1
+        while matched != target and j < len(lines) and lines[j]["page"] == page:
+            if abs(lines[j]["y_position"] - first["y_position"]) >= OUTLINE_MERGE_DISTANCE:
+                break
+            candidate = matched + " " + lines[j]["text"]
+            if candidate == target or target.startswith(candidate + " "):
+                heading_lines.append(j)
+                matched = candidate
+            j += 1
+        if matched == target:
+            return heading_lines
+    return None
+
+def sections_from_outline(lines, outline, doc_name):
+    """Use the headings found by challenge 1a as section boundaries.
+
+    Outline pages are 0-based while line pages are 1-based. Returns [] when the outline
+    does not look trustworthy, so the caller falls back to the local heading detection.
+    """
+    headings = []
+    unmatched = 0
+    pos = 0
+    for entry in outline:
+        target = clean_text(entry.get("text", ""))
+        if not target:
+            continue
+        page = entry.get("page", 0) + 1
+        heading_lines = match_outline_heading(lines, pos, target, page)
+        if heading_lines is None:
+            unmatched += 1
+            continue
+        headings.append({"idx": heading_lines[0], "lines": heading_lines, "level": entry.get("level", "H1"), "text": target, "page": page})
+        pos = heading_lines[-1] + 1
+
+    total = len(headings) + unmatched
+    if not headings:
+        return []
+    if unmatched:
+        print(f"Warning: {unmatched} of {total} outline headings not found in {doc_name}")
+    sections = slice_sections(lines, headings)
+
+    matched_share = len(headings) / total
+    heading_share = sum(len(h["lines"]) for h in headings) / len(lines)
+    empty_share = sum(1 for sec in sections if not sec["content"]) / len(sections)
+    if matched_share < OUTLINE_MIN_MATCHED_SHARE:
+        reason = f"only {matched_share:.0%} of headings matched"
+    elif heading_share > OUTLINE_MAX_HEADING_SHARE:
+        reason = f"headings cover {heading_share:.0%} of lines"
+    elif empty_share > OUTLINE_MAX_EMPTY_SHARE:
+        reason = f"{empty_share:.0%} of sections are empty"
+    else:
+        return sections
+    print(f"Outline for {doc_name} not used ({reason}); falling back to heading detection")
+    return []
+
+# --- Enhanced Section Extraction with Fuzzy Matching ---
+def extract_sections_expected(pdf_path, lines=None):
+    if lines is None:
+        lines = extract_lines(pdf_path)
     
     if not lines:
-        with open(pdf_path, 'rb') as f:
-            content = f.read().decode(errors='ignore')
-        return [{"title": "Document", "content": content, "page": 0}]
+        return no_lines_fallback(pdf_path)
     
     # Fuzzy match lines to expected section patterns
     expected_sections = []
@@ -167,16 +316,7 @@ def extract_sections_expected(pdf_path):
                     expected_sections.append(h)
     
     # Extract section content
-    sections = []
-    for i, h in enumerate(expected_sections):
-        start = h["idx"] + 1
-        end = expected_sections[i+1]["idx"] if i+1 < len(expected_sections) else len(lines)
-        content = " ".join([lines[j]["text"] for j in range(start, end)]).strip()
-        sections.append({
-            "title": h["text"],
-            "content": content,
-            "page": h["page"]
-        })
+    sections = slice_sections(lines, expected_sections)
     
     if not sections:
         all_text = " ".join([l["text"] for l in lines])
@@ -184,6 +324,32 @@ def extract_sections_expected(pdf_path):
     
     return sections
 
+def extract_sections(pdf_path, outline_dir=None, features_dir=None):
+    # Reuse challenge 1a artifacts when available: cached line features avoid re-parsing
+    # the PDF and the 1a outline replaces the local heading detection.
+    doc_name = os.path.basename(pdf_path)
+    stem = os.path.splitext(doc_name)[0]
+    features_path = os.path.join(features_dir, stem + ".json") if features_dir else None
+    outline_path = os.path.join(outline_dir, stem + ".json") if outline_dir else None
+
+    lines = None
+    if features_path and os.path.exists(features_path):
+        lines = load_cached_lines(features_path, pdf_path)
+    if lines is None:
+        lines = extract_lines(pdf_path)
+    if not lines:
+        return no_lines_fallback(pdf_path)
+
+    if outline_path and os.path.exists(outline_path):
+        # The outline JSON carries no fingerprint, so an outline older than the PDF is stale
+        if os.path.getmtime(outline_path) < os.path.getmtime(pdf_path):
+            print(f"Warning: outline for {doc_name} is older than the PDF, not used")
+        else:
+            sections = sections_from_outline(lines, load_outline(outline_path), doc_name)
+            if sections:
+                return sections
+    return extract_sections_expected(pdf_path, lines)
+
 # --- Rule-based Relevance Scoring ---
 def score_sections_rule_based(sections, persona, job, keywords):
     scores = []
@@ -221,6 +387,8 @@ def main():
     parser.add_argument('--output', type=str, default='challenge1b_output.json', help='Path to output JSON file')
     parser.add_argument('--pdf_dir', type=str, default='PDFs', help='Directory containing PDF files')
     parser.add_argument('--top_n', type=int, default=5, help='Number of top sections to extract')
+    parser.add_argument('--outline_dir', type=str, default=None, help='Directory of challenge 1a outline JSON files used as section boundaries')
+    parser.add_argument('--features_dir', type=str, default=None, help='Directory of challenge 1a cached line features')
     args = parser.parse_args()
 
     with open(args.input, 'r', encoding='utf-8') as f:
@@ -236,7 +404,7 @@ def main():
     doc_to_sections = defaultdict(list)
     for pdf_path in pdf_files:
         doc_name = os.path.basename(pdf_path)
-        sections = extract_sections_expected(pdf_path)
+        sections = extract_sections(pdf_path, args.outline_dir, args.features_dir)
         for sec in sections:
             sec["document"] = doc_name
             doc_to_sections[doc_name].append(sec)